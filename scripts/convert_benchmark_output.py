@@ -8,228 +8,399 @@ expected by benchmark-action/github-action-benchmark.
 Usage:
     python3 convert_benchmark_output.py <input_file> <output_file>
     python3 convert_benchmark_output.py benchmark-output.txt output.txt
+    python3 convert_benchmark_output.py --format criterion criterion.txt output.txt
+
+By default the input may be in bencher format, bencher format with JSON timing
+data or Criterion's own output, and results are taken from whichever is found.
+When the format is known, --format {bencher,bencher-json,criterion} scans for
+that format alone.
 """
 
 import argparse
+import functools
+import itertools
 import json
+import mmap
+import os
 import re
+import shutil
 import sys
-
-
-def convert_unit_to_nanoseconds(value: float, unit: str) -> int:
-    """Convert time value from various units to nanoseconds."""
-    unit_multipliers = {
-        "ms": 1_000_000,
-        "us": 1_000,
-        "µs": 1_000,  # Alternative microsecond symbol
-        "ns": 1,
-        "s": 1_000_000_000,
-    }
-
-    multiplier = unit_multipliers.get(unit.lower())
+import tempfile
+from collections.abc import Callable, Iterator
+from typing import IO
+
+# Patterns are bytes, and each is wrapped in one group around the whole format,
+# so in an alternation ``match.lastindex`` tells the format
+
+# Existing bencher format:
+# test benchmark_name ... bench: 123 ns/iter (+/- 45)
+_BENCHER_PATTERN = (
+    rb"(?P<bencher>test\s+(?P<bencher_name>[^\s].+?)\s+\.\.\.\s+bench:\s+"
+    rb"(?P<bencher_value>\d+(?:,\d+)*)\s+ns/iter\s+"
+    rb"\(\+/-\s+(?P<bencher_variance>\d+(?:,\d+)*)\))"
+)
+
+# Bencher output with JSON timing data, one benchmark per line:
+# benchmark_name #2: {"estimate": 1.2, "lower_bound": 1.1, "upper_bound": 1.3, ...}
+# A name starts a line or follows a colon ("mod::scan" gives "scan") or a body;
+# attempts that fail stop at the next colon or brace
+_JSON_PATTERN = (
+    rb"(?P<json>(?:^|(?<=[:}]))\s*(?P<json_name>[^:\s](?:[^:}]*?[^:\s])?)"
+    rb"(?:\s+#\d+)?\s*:\s*(?P<json_body>\{[^{}]+\}))"
+)
+
+# Criterion output:
+# benchmark_name    time:   [1.2345 ms 1.2567 ms 1.2789 ms]
+# \w doesn't match the micro sign in "µs" in a bytes pattern
+_UNIT_PATTERN = b"(?:" + "µ".encode() + rb")?\w+"
+_CRITERION_PATTERN = (
+    rb"(?P<criterion>(?P<criterion_name>\S+)\s+time:\s+\["
+    rb"(?P<low_value>\d+\.?\d*)\s+(?P<low_unit>" + _UNIT_PATTERN + rb")\s+"
+    rb"(?P<median_value>\d+\.?\d*)\s+(?P<median_unit>" + _UNIT_PATTERN + rb")\s+"
+    rb"(?P<high_value>\d+\.?\d*)\s+(?P<high_unit>" + _UNIT_PATTERN + rb")\])"
+)
+
+# The JSON timing data as bencher writes it, with the keys in this order. Other
+# shapes fall back to a full JSON parse.
+_JSON_NUMBER = rb"(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+_JSON_TIMING_RE = re.compile(
+    rb'\{\s*"estimate"\s*:\s*' + _JSON_NUMBER + rb"\s*,"
+    rb'\s*"lower_bound"\s*:\s*' + _JSON_NUMBER + rb"\s*,"
+    rb'\s*"upper_bound"\s*:\s*' + _JSON_NUMBER + rb"\s*,"
+    rb'\s*"unit"\s*:\s*"([^"\\]*)"\s*\}'
+)
+
+# Order of preference between formats when the input mixes several of them
+_FORMATS = ("bencher", "json", "criterion")
+
+# A benchmark result as its name, value and variance, with the times in
+# nanoseconds
+Result = tuple[str, int, int]
+
+# Builds a result from the values of a pattern's inner groups
+Builder = Callable[..., Result]
+
+# Format, result builder and inner group numbers, by outer group number
+Dispatch = dict[int, tuple[str, Builder, range]]
+
+# Output line in bencher format
+_BENCHER_LINE = "test %s ... bench: %d ns/iter (+/- %d)\n"
+
+# Nanoseconds per time unit, keyed by the unit as Criterion and bencher print it
+_UNIT_NANOSECONDS = {
+    b"ms": 1_000_000,
+    b"us": 1_000,
+    "µs".encode(): 1_000,  # Alternative microsecond symbol
+    b"ns": 1,
+    b"s": 1_000_000_000,
+}
+
+
+def unit_multiplier(unit: bytes) -> int:
+    """Look up the nanoseconds per time unit, as printed or in lowercase."""
+    multiplier = _UNIT_NANOSECONDS.get(unit) or _UNIT_NANOSECONDS.get(unit.lower())
     if multiplier is None:
-        raise ValueError(f"Unknown time unit: {unit}")
-
-    return int(value * multiplier)
-
-
-def parse_existing_bencher_format(content: str, debug: bool = False) -> list:
-    """Parse input that's already in bencher format."""
-    # Pattern to match existing bencher format:
-    # test benchmark_name ... bench: 123 ns/iter (+/- 45)
-    pattern = r"test\s+([^\s].+?)\s+\.\.\.\s+bench:\s+(\d+(?:,\d+)*)\s+ns/iter\s+\(\+/-\s+(\d+(?:,\d+)*)\)"
-
-    results = []
-    matches = list(re.finditer(pattern, content))
+        raise ValueError(f"Unknown time unit: {unit.decode(errors='replace')}")
+    return multiplier
+
+
+def scale_decimal(text: bytes, multiplier: int) -> int:
+    """Multiply a decimal like ``1.2345`` by an integer, without float error."""
+    whole, _, fraction = text.partition(b".")
+    value = int(whole) * multiplier
+    if fraction:
+        value += int(fraction) * multiplier // 10 ** len(fraction)
+    return value
+
+
+def bencher_result(name: bytes, value: bytes, variance: bytes) -> Result:
+    """Build a result from the fields of a line in existing bencher format."""
+    value_ns = int(value.replace(b",", b""))  # Remove commas
+    variance_ns = int(variance.replace(b",", b""))
+    return name.strip().decode(), value_ns, variance_ns
+
+
+def json_result(name: bytes, body: bytes) -> Result:
+    """Build a result from the fields of a line of bencher JSON timing data."""
+    timing = _JSON_TIMING_RE.fullmatch(body)
+
+    # Extract values
+    if timing is not None:
+        estimate = float(timing[1])
+        lower_bound = float(timing[2])
+        upper_bound = float(timing[3])
+        unit = timing[4]
+    else:
+        data = json.loads(body)
+        estimate = data.get("estimate", 0)
+        lower_bound = data.get("lower_bound", estimate)
+        upper_bound = data.get("upper_bound", estimate)
+        unit = str(data.get("unit", "ns")).encode()
+
+    # Convert to nanoseconds
+    multiplier = unit_multiplier(unit)
+    value_ns = int(estimate * multiplier)
+    low_ns = int(lower_bound * multiplier)
+    high_ns = int(upper_bound * multiplier)
+
+    # Calculate variance
+    variance = max(abs(value_ns - low_ns), abs(high_ns - value_ns))
+
+    return name.strip().decode(), value_ns, variance
+
+
+def criterion_result(
+    name: bytes,
+    low_value: bytes,
+    low_unit: bytes,
+    median_value: bytes,
+    median_unit: bytes,
+    high_value: bytes,
+    high_unit: bytes,
+) -> Result:
+    """Build a result from the fields of a line of Criterion output."""
+    # Use the median value as the primary benchmark result
+    value_ns = scale_decimal(median_value, unit_multiplier(median_unit))
+
+    # Calculate variance estimate from low and high values
+    low_ns = scale_decimal(low_value, unit_multiplier(low_unit))
+    high_ns = scale_decimal(high_value, unit_multiplier(high_unit))
+
+    variance = max(abs(value_ns - low_ns), abs(high_ns - value_ns))
+
+    return name.decode(), value_ns, variance
+
+
+# Every format as (format, pattern, marker, result builder), loosest pattern
+# last. Only lines containing a format's marker are searched for it.
+_LEXICON: tuple[tuple[str, bytes, bytes, Builder], ...] = (
+    ("bencher", _BENCHER_PATTERN, b"ns/iter", bencher_result),
+    ("criterion", _CRITERION_PATTERN, b"time:", criterion_result),
+    ("json", _JSON_PATTERN, b"{", json_result),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_scanner(
+    formats: tuple[str, ...],
+) -> tuple[re.Pattern[bytes], tuple[bytes, ...], Dispatch]:
+    """Compile one alternation for the given formats, with markers and dispatch."""
+    lexicon = [entry for entry in _LEXICON if entry[0] in formats]
+    regex = re.compile(b"|".join(pattern for _, pattern, _, _ in lexicon))
+    markers = tuple(marker for _, _, marker, _ in lexicon)
+
+    dispatch: Dispatch = {}
+    group = 1
+    for fmt, pattern, _, builder in lexicon:
+        group_count = re.compile(pattern).groups
+        dispatch[group] = (fmt, builder, range(group + 1, group + group_count))
+        group += group_count
+
+    return regex, markers, dispatch
+
+
+def build_result(
+    builder: Builder, fields: tuple[bytes, ...], debug: bool = False
+) -> Result | None:
+    """Build a result from the fields of a match, or None if they're invalid."""
+    try:
+        result = builder(*fields)
+    # json.JSONDecodeError and UnicodeDecodeError are both ValueErrors
+    except ValueError as e:
+        if debug:
+            test_name = fields[0].strip().decode(errors="replace")
+            print(f"Warning: Skipping benchmark '{test_name}': {e}", file=sys.stderr)
+        return None
 
     if debug:
-        print(f"Bencher format pattern found {len(matches)} matches", file=sys.stderr)
-
-    for match in matches:
-        test_name = match.group(1).strip()
-        value_str = match.group(2).replace(",", "")  # Remove commas
-        variance_str = match.group(3).replace(",", "")  # Remove commas
-
-        try:
-            value = int(value_str)
-            variance = int(variance_str)
-
-            if debug:
-                print(
-                    f"Parsed: {test_name} -> {value} ns/iter (+/- {variance})",
-                    file=sys.stderr,
-                )
+        print(
+            "Parsed: %s -> %d ns/iter (+/- %d)" % result,
+            file=sys.stderr,
+        )
+    return result
+
+
+def scan_lines(lines, formats, debug: bool = False) -> Iterator[tuple[str, Result]]:
+    """Yield benchmark results in any of the given formats, with their format."""
+    formats = tuple(formats)
+    regex, markers, dispatch = compile_scanner(formats)
+    counts = dict.fromkeys(formats, 0)
+    previous_line = b""
+    line_count = 0
+
+    for line_count, line in enumerate(lines, 1):
+        if any(marker in line for marker in markers):
+            matches = [(dispatch, match) for match in regex.finditer(line)]
+
+            # Criterion prints long benchmark names on a line of their own,
+            # followed by the timing line
+            if (
+                not matches
+                and previous_line
+                and "criterion" in formats
+                and line.lstrip().startswith(b"time:")
+            ):
+                criterion_regex, _, table = compile_scanner(("criterion",))
+                name = previous_line.split()[-1]
+                match = criterion_regex.match(name + b" " + line)
+                if match is not None:
+                    matches.append((table, match))
+
+            for table, match in matches:
+                # lastindex is never None, as each format's group spans its match
+                fmt, builder, groups = table[match.lastindex]  # type: ignore[index]
+                result = build_result(builder, match.group(*groups), debug)
+                if result is not None:
+                    counts[fmt] += 1
+                    yield fmt, result
+
+        if line.strip():
+            previous_line = line
 
-            results.append({"name": test_name, "value": value, "variance": variance})
+    if debug:
+        print(f"Total lines: {line_count}", file=sys.stderr)
+        for fmt in formats:
+            print(f"Found {counts[fmt]} {fmt} format results", file=sys.stderr)
 
-        except ValueError as e:
-            if debug:
-                print(
-                    f"Warning: Skipping benchmark '{test_name}': {e}", file=sys.stderr
-                )
-            continue
 
-    return results
+def parse_existing_bencher_format(lines, debug: bool = False) -> Iterator[Result]:
+    """Parse input that's already in bencher format."""
+    for _, result in scan_lines(lines, ("bencher",), debug):
+        yield result
 
 
-def parse_bencher_json_output(content: str, debug: bool = False) -> list:
+def parse_bencher_json_output(lines, debug: bool = False) -> Iterator[Result]:
     """Parse bencher format output with JSON timing data."""
-    # Multiple patterns to try
-    patterns = [
-        # Pattern 1: Standard format with optional #N suffix
-        r"([^:\n]+?)(?:\s+#\d+)?\s*:\s*(\{[^}]+\})",
-        # Pattern 2: More flexible whitespace handling
-        r"(.+?)\s*:\s*(\{[^}]+\})",
-        # Pattern 3: Line-by-line approach
-        r"^([^:\n]+?)\s*:\s*(\{.+?\})",
-    ]
-
-    results = []
-
-    for i, pattern in enumerate(patterns):
-        if debug:
-            print(f"Trying JSON pattern {i+1}: {pattern}", file=sys.stderr)
-
-        matches = list(re.finditer(pattern, content, re.MULTILINE))
-        if debug:
-            print(f"JSON pattern {i+1} found {len(matches)} matches", file=sys.stderr)
-
-        if matches:
-            for match in matches:
-                test_name = match.group(1).strip()
-                json_data = match.group(2)
-
-                if debug:
-                    print(
-                        f"Match: '{test_name}' -> '{json_data[:50]}...'",
-                        file=sys.stderr,
-                    )
-
-                try:
-                    # Parse JSON data
-                    data = json.loads(json_data)
-
-                    # Extract values
-                    estimate = data.get("estimate", 0)
-                    lower_bound = data.get("lower_bound", estimate)
-                    upper_bound = data.get("upper_bound", estimate)
-                    unit = data.get("unit", "ns")
-
-                    # Convert to nanoseconds
-                    value_ns = convert_unit_to_nanoseconds(estimate, unit)
-                    low_ns = convert_unit_to_nanoseconds(lower_bound, unit)
-                    high_ns = convert_unit_to_nanoseconds(upper_bound, unit)
-
-                    # Calculate variance
-                    variance = max(abs(value_ns - low_ns), abs(high_ns - value_ns))
-
-                    results.append(
-                        {"name": test_name, "value": value_ns, "variance": variance}
-                    )
-
-                except (json.JSONDecodeError, ValueError) as e:
-                    if debug:
-                        print(
-                            f"Warning: Skipping benchmark '{test_name}': {e}",
-                            file=sys.stderr,
-                        )
-                    continue
-
-            # If we found results with this pattern, stop trying others
-            if results:
-                if debug:
-                    print(
-                        f"Successfully parsed {len(results)} results with JSON pattern {i+1}",
-                        file=sys.stderr,
-                    )
-                break
+    for _, result in scan_lines(lines, ("json",), debug):
+        yield result
 
-    return results
 
-
-def parse_criterion_output(content: str, debug: bool = False) -> list:
+def parse_criterion_output(lines, debug: bool = False) -> Iterator[Result]:
     """Parse Criterion benchmark output and extract timing information."""
-    # Pattern to match Criterion output
-    # Example: "benchmark_name    time:   [1.2345 ms 1.2567 ms 1.2789 ms]"
-    pattern = r"(\S+)\s+time:\s+\[(\d+\.?\d*)\s+(\w+)\s+(\d+\.?\d*)\s+(\w+)\s+(\d+\.?\d*)\s+(\w+)\]"
-
-    results = []
-    matches = list(re.finditer(pattern, content))
-
-    if debug:
-        print(f"Criterion pattern found {len(matches)} matches", file=sys.stderr)
+    for _, result in scan_lines(lines, ("criterion",), debug):
+        yield result
 
-    for match in matches:
-        test_name = match.group(1)
 
-        # Extract the three timing values (low, median, high estimates)
-        low_value = float(match.group(2))
-        low_unit = match.group(3)
-        median_value = float(match.group(4))
-        median_unit = match.group(5)
-        high_value = float(match.group(6))
-        high_unit = match.group(7)
+def parse_benchmark_output(lines, debug: bool = False) -> Iterator[Result]:
+    """Parse benchmark output in whichever supported format it's in.
 
-        # Use the median value as the primary benchmark result
-        try:
-            value_ns = convert_unit_to_nanoseconds(median_value, median_unit)
+    ``lines`` can be any iterable of lines as bytes, such as a file opened in
+    binary mode, and is consumed only once.
+    """
+    if debug:
+        print("Analyzing input content...", file=sys.stderr)
+        print("First 5 non-empty lines:", file=sys.stderr)
 
-            # Calculate variance estimate from low and high values
-            low_ns = convert_unit_to_nanoseconds(low_value, low_unit)
-            high_ns = convert_unit_to_nanoseconds(high_value, high_unit)
-            variance = max(abs(value_ns - low_ns), abs(high_ns - value_ns))
+        # Read only as far as needed, then put those lines back for the scan
+        lines = iter(lines)
+        head = []
+        non_empty = 0
+        for line in lines:
+            head.append(line)
+            if line.strip():
+                text = line.rstrip().decode(errors="replace")
+                print(f"  {len(head)}: {text[:100]}", file=sys.stderr)
+                non_empty += 1
+                if non_empty == 5:
+                    break
+        lines = itertools.chain(head, lines)
+
+    # A format earlier in _FORMATS wins when the input mixes several of them.
+    # Results in the first format are passed on as soon as they're found; the
+    # others are held back in case that format never turns up, and dropped as
+    # soon as it does.
+    preferred = _FORMATS[0]
+    held_back: dict[str, list[Result]] | None = {fmt: [] for fmt in _FORMATS[1:]}
+    for fmt, result in scan_lines(lines, _FORMATS, debug):
+        if fmt == preferred:
+            held_back = None
+            yield result
+        elif held_back is not None:
+            held_back[fmt].append(result)
+
+    if held_back is not None:
+        for fmt in _FORMATS[1:]:
+            if held_back[fmt]:
+                yield from held_back[fmt]
+                break
 
-            results.append({"name": test_name, "value": value_ns, "variance": variance})
 
-        except ValueError as e:
-            if debug:
-                print(
-                    f"Warning: Skipping benchmark '{test_name}': {e}", file=sys.stderr
-                )
-            continue
+# Parser for each --format choice
+_PARSERS = {
+    "auto": parse_benchmark_output,
+    "bencher": parse_existing_bencher_format,
+    "bencher-json": parse_bencher_json_output,
+    "criterion": parse_criterion_output,
+}
+
+
+def write_bencher_format(results, output_file: str, verbose: bool = False) -> int:
+    """Write benchmark results in bencher format as they're produced.
+
+    If parsing fails part way, an existing output file is left as it was and
+    a new one is removed. Returns the number of results written.
+    """
+    format_line = _BENCHER_LINE.__mod__
+    count = 0
+
+    # An existing regular file is replaced by a complete copy. Anything else,
+    # such as a symlink or /dev/stdout, is written in place.
+    replace = os.path.isfile(output_file) and not os.path.islink(output_file)
+    created = not os.path.lexists(output_file)
+
+    # A large buffer turns one write per result into a few big writes
+    f: IO[str]
+    if replace:
+        f = tempfile.NamedTemporaryFile(
+            "w",
+            buffering=1 << 20,
+            dir=os.path.dirname(output_file) or ".",
+            delete=False,
+        )
+        shutil.copymode(output_file, f.name)
+    else:
+        f = open(output_file, "w", buffering=1 << 20)
 
-    return results
+    try:
+        with f:
+            for result in results:
+                f.write(format_line(result))
+                count += 1
+                if verbose:
+                    print(f"  {result[0]}: {result[1]} ns/iter")
+    except BaseException:
+        if replace or created:
+            os.remove(f.name)
+        raise
 
+    if replace:
+        os.replace(f.name, output_file)
 
-def parse_benchmark_output(content: str, debug: bool = False) -> list:
-    """Parse benchmark output, trying different formats."""
-    if debug:
-        print("Analyzing input content...", file=sys.stderr)
-        lines = content.split("\n")
-        print(f"Total lines: {len(lines)}", file=sys.stderr)
-        print("First 5 non-empty lines:", file=sys.stderr)
-        for i, line in enumerate(lines[:10]):
-            if line.strip():
-                print(f"  {i+1}: {line[:100]}", file=sys.stderr)
+    return count
 
-    # First check if input is already in bencher format
-    results = parse_existing_bencher_format(content, debug)
 
-    # If no results, try bencher JSON format
-    if not results:
-        results = parse_bencher_json_output(content, debug)
+def map_lines(f):
+    """Yield the lines of a binary file, memory-mapping it rather than reading.
 
-    # If still no results, try Criterion format
-    if not results:
-        if debug:
-            print(
-                "No results from JSON format, trying Criterion format...",
-                file=sys.stderr,
-            )
-        results = parse_criterion_output(content, debug)
+    The OS then pages the file in as it's scanned. Files that can't be mapped,
+    such as empty files and pipes, are read normally instead.
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        yield from f
+        return
 
-    return results
+    with mm:
+        yield from iter(mm.readline, b"")
 
 
-def write_bencher_format(results: list, output_file: str):
-    """Write benchmark results in bencher format."""
-    with open(output_file, "w") as f:
-        for result in results:
-            # Format: test <name> ... bench: <value> ns/iter (+/- <variance>)
-            f.write(
-                f"test {result['name']} ... bench: {result['value']} ns/iter "
-                f"(+/- {result['variance']})\n"
-            )
+def collect_test_lines(lines, test_lines: list[str]) -> Iterator[bytes]:
+    """Pass lines through, keeping those that start with "test " as text."""
+    for line in lines:
+        if line.strip().startswith(b"test "):
+            test_lines.append(line.rstrip(b"\n").decode(errors="replace"))
+        yield line
 
 
 def main():
@@ -240,6 +411,12 @@ def main():
         "input_file", help="Input file containing Criterion benchmark output"
     )
     parser.add_argument("output_file", help="Output file for bencher format results")
+    parser.add_argument(
+        "--format",
+        choices=list(_PARSERS),
+        default="auto",
+        help="Format of the input (default: detect it)",
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose output"
     )
@@ -250,34 +427,34 @@ def main():
     args = parser.parse_args()
 
     try:
-        # Read input file
-        with open(args.input_file, "r", encoding="utf-8") as f:
-            content = f.read()
+        # Stream the input file, so that only a line at a time is kept in memory
+        with open(args.input_file, "rb", buffering=1 << 20) as f:
+            if args.verbose:
+                print(f"Reading benchmark output from: {args.input_file}")
 
-        if args.verbose:
-            print(f"Reading benchmark output from: {args.input_file}")
-
-        if args.debug:
-            print(f"Input file size: {len(content)} characters", file=sys.stderr)
-            print(
-                f"Input content (first 200 chars):\n{content[:200]}\n", file=sys.stderr
-            )
+            if args.debug:
+                size = os.fstat(f.fileno()).st_size
+                print(f"Input file size: {size} bytes", file=sys.stderr)
+                # Peek rather than read and seek back, so pipes work too
+                head = f.peek(200)[:200].decode(errors="replace")
+                print(f"Input content (first 200 bytes):\n{head}\n", file=sys.stderr)
+
+            # Note the lines starting with "test " as they're read, for the
+            # manual search below, since a pipe can't be read a second time
+            lines = map_lines(f)
+            test_lines: list[str] = []
+            if args.debug:
+                lines = collect_test_lines(lines, test_lines)
 
-        # Parse benchmark output
-        results = parse_benchmark_output(content, args.debug)
+            # Parse benchmark output straight into the bencher format output
+            results = _PARSERS[args.format](lines, args.debug)
+            count = write_bencher_format(results, args.output_file, args.verbose)
 
-        if not results:
+        if count == 0:
             print("Warning: No benchmark results found in input file", file=sys.stderr)
 
             if args.debug:
                 print("Debug: Manual pattern search...", file=sys.stderr)
-
-                # Look for test lines
-                test_lines = [
-                    line
-                    for line in content.split("\n")
-                    if line.strip().startswith("test ")
-                ]
                 print(
                     f"Found {len(test_lines)} lines starting with 'test'",
                     file=sys.stderr,
@@ -285,18 +462,12 @@ def main():
                 for i, line in enumerate(test_lines[:3]):
                     print(f"  {i+1}: {line}", file=sys.stderr)
 
-            # Create a dummy result to avoid empty output
-            results = [{"name": "dummy_benchmark", "value": 1000, "variance": 0}]
-
-        if args.verbose:
-            print(f"Found {len(results)} benchmark results")
-            for result in results:
-                print(f"  {result['name']}: {result['value']} ns/iter")
-
-        # Write bencher format output
-        write_bencher_format(results, args.output_file)
+            # Write a dummy result to avoid empty output
+            dummy = ("dummy_benchmark", 1000, 0)
+            count = write_bencher_format([dummy], args.output_file, args.verbose)
 
         if args.verbose:
+            print(f"Found {count} benchmark results")
             print(f"Results written to: {args.output_file}")
 
         return 0